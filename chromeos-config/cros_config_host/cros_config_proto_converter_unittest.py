@@ -7,8 +7,8 @@
 
 # pylint: disable=missing-docstring,protected-access
 
+import difflib
 import pathlib
-import subprocess
 import unittest
 
 # pylint: disable=import-error
@@ -37,6 +37,56 @@ def fake_config():
     )
 
 
+def diff_dirs(expected_dir, actual_dir):
+    """Compare two directory trees in-process, like `diff -ru`.
+
+    Unlike diff, every path under a directory that exists on one side only
+    is listed, not just the directory itself.
+
+    Returns:
+        A list of lines describing the differences, empty if none.
+    """
+
+    def _entries(root):
+        return {path.relative_to(root) for path in root.rglob("*")}
+
+    expected_entries = _entries(expected_dir)
+    actual_entries = _entries(actual_dir)
+    diff = []
+    for path in sorted(expected_entries - actual_entries):
+        diff.append(f"Only in {expected_dir}: {path}\n")
+    for path in sorted(actual_entries - expected_entries):
+        diff.append(f"Only in {actual_dir}: {path}\n")
+    for path in sorted(expected_entries & actual_entries):
+        expected_path = expected_dir / path
+        actual_path = actual_dir / path
+        if expected_path.is_dir() or actual_path.is_dir():
+            if expected_path.is_dir() != actual_path.is_dir():
+                diff.append(
+                    f"{expected_path} and {actual_path} are not both "
+                    "directories\n"
+                )
+            continue
+        expected = expected_path.read_bytes()
+        actual = actual_path.read_bytes()
+        if expected == actual:
+            continue
+        try:
+            diff.extend(
+                difflib.unified_diff(
+                    expected.decode("utf-8").splitlines(keepends=True),
+                    actual.decode("utf-8").splitlines(keepends=True),
+                    fromfile=str(expected_path),
+                    tofile=str(actual_path),
+                )
+            )
+        except UnicodeDecodeError:
+            diff.append(
+                f"Binary files {expected_path} and {actual_path} differ\n"
+            )
+    return diff
+
+
 class ParseArgsTests(unittest.TestCase):
     """Test CLI argument parsing."""
 
@@ -88,23 +138,10 @@ class MainTest(cros_test_lib.TempDirTestCase):
         output_file.write_text(contents)
 
         # Check all the files in output_dir
-        # pylint: disable=subprocess-run-check
-        result = subprocess.run(
-            [
-                "diff",
-                "-ru",
-                TEST_DATA_DIR,
-                output_dir,
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            encoding="utf-8",
-        )
-        # pylint: enable=subprocess-run-check
-        if result.returncode:
+        diff = diff_dirs(TEST_DATA_DIR, output_dir)
+        if diff:
             msg = [""]  # to start with a newline
-            msg.append(result.stderr)
-            msg.append(result.stdout)
+            msg.append("".join(diff))
             msg.append(
                 "Fake project transform does not match.\n"
                 "Please run ./regen.sh and amend your changes if necessary.\n"
@@ -115,15 +152,25 @@ class MainTest(cros_test_lib.TempDirTestCase):
 class TransformBuildConfigsTest(unittest.TestCase):
     """Test _transform_build_configs function."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Parse the fake config files once; each test gets its own copy.
+        cls._fake_config = fake_config()
+
+    def copy_fake_config(self):
+        config = type(self._fake_config)()
+        config.CopyFrom(self._fake_config)
+        return config
+
     def test_missing_lookups(self):
-        config = fake_config()
+        config = self.copy_fake_config()
         config.ClearField("program_list")
 
         with self.assertRaisesRegex(Exception, "Failed to lookup Program"):
             cros_config_proto_converter._transform_build_configs(config)
 
     def test_empty_device_brand(self):
-        config = fake_config()
+        config = self.copy_fake_config()
         config.ClearField("device_brand_list")
         # Signer configs tied to device brands, so need to clear that also
         config.program_list[0].ClearField("device_signer_configs")
@@ -133,16 +180,16 @@ class TransformBuildConfigsTest(unittest.TestCase):
         )
 
     def test_missing_sw_config(self):
-        config = fake_config()
+        config = self.copy_fake_config()
         config.ClearField("software_configs")
 
         with self.assertRaisesRegex(Exception, "Software config is required"):
             cros_config_proto_converter._transform_build_configs(config)
 
     def test_unique_configs_only(self):
-        config = fake_config()
+        config = self.copy_fake_config()
         duplicate_config = cros_config_proto_converter._merge_configs(
-            [config, fake_config()]
+            [config, self.copy_fake_config()]
         )
 
         with self.assertRaisesRegex(Exception, "Multiple software configs"):
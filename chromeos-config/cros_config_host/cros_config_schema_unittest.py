@@ -6,6 +6,8 @@
 # pylint: disable=module-missing-docstring,class-missing-docstring
 
 import contextlib
+import filecmp
+import functools
 import io
 from itertools import zip_longest
 import json
@@ -67,6 +69,12 @@ chromeos:
 """
 
 
+@functools.lru_cache()
+def _TransformBasicConfig():
+    """Returns TransformConfig(BASIC_CONFIG), computed once for all tests."""
+    return cros_config_schema.TransformConfig(BASIC_CONFIG)
+
+
 class MergeDictionaries(cros_test_lib.TestCase):
     def testBaseKeyMerge(self):
         primary = {"a": {"b": 1, "c": 2}}
@@ -99,7 +107,7 @@ class ParseArgsTests(cros_test_lib.TestCase):
 
 class TransformConfigTests(cros_test_lib.TestCase):
     def testBasicTransform(self):
-        result = cros_config_schema.TransformConfig(BASIC_CONFIG)
+        result = _TransformBasicConfig()
         json_dict = json.loads(result)
         self.assertEqual(len(json_dict), 1)
         configs = json_dict["chromeos"]["configs"]
@@ -213,20 +221,20 @@ chromeos:
 
 
 class ValidateConfigSchemaTests(cros_test_lib.TestCase):
-    def setUp(self):
-        self._schema = cros_config_schema.ReadSchema()
+    @classmethod
+    def setUpClass(cls):
+        cls._validator = libcros_schema.GetValidator(
+            cros_config_schema.ReadSchema()
+        )
 
     def testBasicSchemaValidation(self):
-        libcros_schema.ValidateConfigSchema(
-            self._schema, cros_config_schema.TransformConfig(BASIC_CONFIG)
-        )
+        self._validator.validate(json.loads(_TransformBasicConfig()))
 
     def testMissingRequiredElement(self):
-        config = re.sub(r" *cras-config-dir: .*", "", BASIC_CONFIG)
         config = re.sub(r" *volume: .*", "", BASIC_CONFIG)
         try:
-            libcros_schema.ValidateConfigSchema(
-                self._schema, cros_config_schema.TransformConfig(config)
+            self._validator.validate(
+                json.loads(cros_config_schema.TransformConfig(config))
             )
         except jsonschema.ValidationError as err:
             self.assertIn("required", err.__str__())
@@ -235,8 +243,8 @@ class ValidateConfigSchemaTests(cros_test_lib.TestCase):
     def testReferencedNonExistentTemplateVariable(self):
         config = re.sub(r" *$card: .*", "", BASIC_CONFIG)
         try:
-            libcros_schema.ValidateConfigSchema(
-                self._schema, cros_config_schema.TransformConfig(config)
+            self._validator.validate(
+                json.loads(cros_config_schema.TransformConfig(config))
             )
         except cros_config_schema.ValidationError as err:
             self.assertIn("Referenced template variable", err.__str__())
@@ -245,8 +253,8 @@ class ValidateConfigSchemaTests(cros_test_lib.TestCase):
     def testSkuIdOutOfBound(self):
         config = BASIC_CONFIG.replace("$sku-id: 0", "$sku-id: 0x80000000")
         with self.assertRaises(jsonschema.ValidationError) as ctx:
-            libcros_schema.ValidateConfigSchema(
-                self._schema, cros_config_schema.TransformConfig(config)
+            self._validator.validate(
+                json.loads(cros_config_schema.TransformConfig(config))
             )
         if version.parse(jsonschema.__version__) >= version.Version("3.0.0"):
             self.assertIn(
@@ -258,6 +266,29 @@ class ValidateConfigSchemaTests(cros_test_lib.TestCase):
             self.assertIn("'sku-id': %i" % 0x80000000, str(ctx.exception))
             self.assertIn("is not valid", str(ctx.exception))
 
+    def testMultipleErrorsReportsBestMatch(self):
+        config = BASIC_CONFIG.replace(
+            "$sku-id: 0", "$sku-id: 0x80000000"
+        ).replace("name: '{{$name}}'", "name: 5")
+        schema = cros_config_schema.ReadSchema()
+        transformed = cros_config_schema.TransformConfig(config)
+        with self.assertRaises(jsonschema.ValidationError) as ctx:
+            libcros_schema.ValidateConfigSchema(schema, transformed)
+        # The same error jsonschema.validate() picks should be reported.
+        with self.assertRaises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(
+                json.loads(transformed), libcros_schema.LoadYaml(schema)
+            )
+        self.assertEqual(expected.exception.message, ctx.exception.message)
+        if version.parse(jsonschema.__version__) >= version.Version("3.0.0"):
+            self.assertEqual("5 is not of type 'string'", ctx.exception.message)
+
+    def testGetValidatorIsCached(self):
+        self.assertIs(
+            libcros_schema.GetValidator(cros_config_schema.ReadSchema()),
+            libcros_schema.GetValidator(cros_config_schema.ReadSchema()),
+        )
+
 
 class ValidateFingerprintSchema(cros_test_lib.TestCase):
     def setUp(self):
@@ -462,9 +493,7 @@ INVALID_CUSTOM_LABEL_CONFIG_FEATURE = """
 
 class ValidateConfigTests(cros_test_lib.TestCase):
     def testBasicValidation(self):
-        cros_config_schema.ValidateConfig(
-            cros_config_schema.TransformConfig(BASIC_CONFIG)
-        )
+        cros_config_schema.ValidateConfig(_TransformBasicConfig())
 
     def testIdentitiesNotUnique(self):
         config = """
@@ -817,7 +846,7 @@ class FilterBuildElements(cros_test_lib.TestCase):
     def testBasicFilterBuildElements(self):
         json_dict = json.loads(
             cros_config_schema.FilterBuildElements(
-                cros_config_schema.TransformConfig(BASIC_CONFIG), ["/firmware"]
+                _TransformBasicConfig(), ["/firmware"]
             )
         )
         self.assertNotIn("firmware", json_dict["chromeos"]["configs"][0])
@@ -875,6 +904,11 @@ class MainTests(cros_test_lib.TempDirTestCase):
             f"Actual file does not exist at path: {file_actual}",
         )
 
+        # Files are almost always identical, so try a cheap byte comparison
+        # before walking them line by line to describe the difference.
+        if filecmp.cmp(file_expected, file_actual, shallow=False):
+            return
+
         regen_message = (
             "Please run ./regen.sh in the chromeos-config directory."
         )
@@ -19,11 +19,11 @@ this_dir = os.path.dirname(__file__)
 
 class SchemaTests(unittest.TestCase):
     def testActualSchemaAgainstReadme(self):
-        output = tempfile.mktemp()
-        generate_schema_doc.Main(
-            os.path.join(this_dir, "cros_config_schema.yaml"), output
-        )
-        with open(output, "rb") as output_stream:
+        with tempfile.NamedTemporaryFile() as output_stream:
+            generate_schema_doc.Main(
+                os.path.join(this_dir, "cros_config_schema.yaml"),
+                output_stream.name,
+            )
             output_lines = output_stream.read().decode("utf-8").splitlines()
             with open(
                 os.path.join(this_dir, "../README.md"), "rb"
@@ -48,8 +48,6 @@ class SchemaTests(unittest.TestCase):
                     "Please run ./regen.sh in the chromeos-config directory.",
                 )
 
-        os.remove(output)
-
 
 if __name__ == "__main__":
     unittest.main()
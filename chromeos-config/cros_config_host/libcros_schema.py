@@ -10,11 +10,11 @@ Provides common cros_config and cros_config_test schema functions.
 from __future__ import print_function
 
 import collections
+import functools
 import json
 import os
 import re
 
-from jsonschema import validate  # pylint: disable=import-error
 import yaml  # pylint: disable=import-error
 
 
@@ -50,6 +50,31 @@ def LoadYaml(stream):
     return yaml.load(stream, Loader=loader)
 
 
+@functools.lru_cache()
+def GetValidator(schema):
+    """Builds a reusable validator for the schema specified.
+
+    The schema is parsed and checked once per distinct schema, so validating
+    many configs against the same schema doesn't repeat that cost.
+
+    Args:
+        schema: Source schema used to verify configs.
+
+    Returns:
+        A jsonschema validator whose validate() method takes a parsed
+        (transformed) config.
+    """
+    # jsonschema is slow to import and only needed for validation, so don't
+    # make users of the other helpers here pay for it.
+    # pylint: disable=import-error,import-outside-toplevel
+    from jsonschema import validators
+
+    schema_json = LoadYaml(schema)
+    validator_cls = validators.validator_for(schema_json)
+    validator_cls.check_schema(schema_json)
+    return validator_cls(schema_json)
+
+
 def ValidateConfigSchema(schema, config):
     """Validates a transformed config against the schema specified.
 
@@ -59,9 +84,15 @@ def ValidateConfigSchema(schema, config):
         schema: Source schema used to verify the config.
         config: Config (transformed) that will be verified.
     """
+    # pylint: disable=import-error,import-outside-toplevel
+    from jsonschema import exceptions
+
     json_config = json.loads(config)
-    schema_json = LoadYaml(schema)
-    validate(json_config, schema_json)
+    # Report the same error jsonschema.validate() would pick, rather than
+    # whichever one the validator happens to find first.
+    error = exceptions.best_match(GetValidator(schema).iter_errors(json_config))
+    if error:
+        raise error
 
 
 def FindImports(config_file, includes):
@@ -12,6 +12,7 @@ google storage so that we could use it in cross-version login testing.
 """
 
 import argparse
+import concurrent.futures
 import hashlib
 from pathlib import Path
 import re
@@ -21,7 +22,7 @@ import subprocess
 import sys
 import tempfile
 import time
-from typing import List, NamedTuple, Optional
+from typing import IO, List, NamedTuple, Optional, Sequence
 
 
 VM_HOST = "127.0.0.1"
@@ -129,7 +130,7 @@ def setup_ssh_identity(
     source_path = (
         ssh_identity_file if ssh_identity_file else default_ssh_identity_file()
     )
-    target_path = Path(f"{temp_path}/ssh_key")
+    target_path = temp_path / "ssh_key"
     shutil.copy(source_path, target_path)
     # Permissions need to be adjusted to prevent ssh complaints.
     target_path.chmod(stat.S_IREAD)
@@ -137,8 +138,7 @@ def setup_ssh_identity(
 
 
 def default_ssh_identity_file() -> Path:
-    home = Path.home()
-    return Path(f"{home}/chromiumos/chromite/ssh_keys/testing_rsa")
+    return Path.home() / "chromiumos/chromite/ssh_keys/testing_rsa"
 
 
 def download_vm_image(board: str, version: Version, temp_path: Path) -> Path:
@@ -157,16 +157,40 @@ def download_vm_image(board: str, version: Version, temp_path: Path) -> Path:
             f"gs://chromeos-image-archive/{board}-release/{version}/"
             f"chromiumos_test_image.tar.xz"
         )
-    archive_path = Path(f"{temp_path}/chromiumos_test_image.tar.xz")
-    check_run("gsutil", "cp", image_url, archive_path)
-    # Unpack the .tar.xz archive.
-    check_run("tar", "Jxf", archive_path, "-C", temp_path)
-    target_path = Path(f"{temp_path}/chromiumos_test_image.bin")
+    # Stream the .tar.xz archive from GS straight into tar, so that the
+    # download and the unpacking overlap and the archive never hits the disk.
+    check_pipe(
+        ("gsutil", "cp", image_url, "-"),
+        (
+            "tar",
+            f"--use-compress-program={xz_decompress_command()}",
+            "-xf",
+            "-",
+            "-C",
+            temp_path,
+        ),
+    )
+    target_path = temp_path / "chromiumos_test_image.bin"
     if not target_path.exists():
         raise RuntimeError(f"No {target_path} in VM archive")
     return target_path
 
 
+def xz_decompress_command() -> str:
+    """Returns the xz command line for unpacking, multi-threaded if possible."""
+    result = subprocess.run(
+        ("xz", "--help"),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+        check=False,
+    )
+    if "--threads" in result.stdout:
+        # Use as many threads as there are cores.
+        return "xz -d -T0"
+    return "xz -d"
+
+
 def start_vm(image_path: Path, board: str) -> None:
     """Runs the VM emulator."""
     check_run(
@@ -217,34 +241,44 @@ def upload_data(
     ssh_identity: Path,
 ) -> None:
     """Creates resulting artifacts and uploads to the GS."""
-    DUT_ARTIFACTS_DIR = "/tmp/cross_version_login"
+    DUT_ARTIFACTS_DIR = Path("/tmp/cross_version_login")
     date = time.strftime("%Y%m%d")
     prefix = f"{version}_{board}_{date}"
-    # Grab the data file from the DUT.
     data_file = f"{prefix}_data.tar.gz"
-    dut_data_path = Path(f"{DUT_ARTIFACTS_DIR}/data.tar.gz")
-    data_path = Path(f"{temp_path}/{data_file}")
-    copy_from_dut(dut_data_path, data_path, ssh_identity)
-    # Grab the config file from the DUT.
-    dut_config_path = Path(f"{DUT_ARTIFACTS_DIR}/config.json")
-    config_path = Path(f"{output_dir}/{prefix}_config.json")
-    copy_from_dut(dut_config_path, config_path, ssh_identity)
-    print(f'Config file is created at "{config_path}".', file=sys.stderr)
-    # Generate the external data file that points to the file in GS.
+    dut_data_path = DUT_ARTIFACTS_DIR / "data.tar.gz"
+    data_path = temp_path / data_file
+    dut_config_path = DUT_ARTIFACTS_DIR / "config.json"
+    config_path = output_dir / f"{prefix}_config.json"
     gs_url = (
         f"gs://chromiumos-test-assets-public/tast/cros/hwsec/"
         f"cross_version_login/{data_file}"
     )
-    external_data = generate_external_data(gs_url, data_path)
-    external_data_path = Path(f"{output_dir}/{data_file}.external")
-    with open(external_data_path, "w") as f:
-        f.write(external_data)
-    print(
-        f'External data file is created at "{external_data_path}".',
-        file=sys.stderr,
-    )
-    # Upload the data file to Google Cloud Storage.
-    check_run("gsutil", "cp", data_path, gs_url)
+    external_data_path = output_dir / f"{data_file}.external"
+    # The steps below are independent pairs, so run each pair concurrently.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        # Grab the data and the config files from the DUT.
+        copies = [
+            executor.submit(
+                copy_from_dut, dut_data_path, data_path, ssh_identity
+            ),
+            executor.submit(
+                copy_from_dut, dut_config_path, config_path, ssh_identity
+            ),
+        ]
+        for copy in copies:
+            copy.result()
+        print(f'Config file is created at "{config_path}".', file=sys.stderr)
+        # Upload the data file to Google Cloud Storage while generating the
+        # external data file that points to it.
+        upload = executor.submit(check_run, "gsutil", "cp", data_path, gs_url)
+        external_data = generate_external_data(gs_url, data_path)
+        with open(external_data_path, "w") as f:
+            f.write(external_data)
+        print(
+            f'External data file is created at "{external_data_path}".',
+            file=sys.stderr,
+        )
+        upload.result()
     print(f"Testing data is uploaded to {gs_url}", file=sys.stderr)
 
 
@@ -290,34 +324,70 @@ def generate_external_data(gs_url: str, data_path: Path) -> str:
 """
 
 
-def check_run(*args: str) -> None:
+def check_run(*args: str, stdin: Optional[IO[bytes]] = None) -> None:
     """Runs the given command; throws on failure."""
-    try:
-        subprocess.run(
-            args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True
-        )
-    except subprocess.CalledProcessError as exc:
-        # Print the output to aid debugging (the exception message doesn't
-        # include the output).
-        print(
-            "Command",
-            args,
-            "printed:\n",
-            exc.output.decode("utf-8"),
-            file=sys.stderr,
-        )
-        raise
+    # The output is only needed if the command fails, so send it to a
+    # temporary file rather than holding it all in memory.
+    with tempfile.TemporaryFile() as output:
+        try:
+            subprocess.run(
+                args,
+                stdin=stdin,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+                check=True,
+            )
+        except subprocess.CalledProcessError:
+            print_output(args, output)
+            raise
+
+
+def check_pipe(source_args: Sequence[str], sink_args: Sequence[str]) -> None:
+    """Runs source_args piped into sink_args; throws on failure."""
+    with tempfile.TemporaryFile() as source_output, subprocess.Popen(
+        source_args, stdout=subprocess.PIPE, stderr=source_output
+    ) as source:
+        try:
+            check_run(*sink_args, stdin=source.stdout)
+        finally:
+            # Close our end of the pipe, so that the source gets SIGPIPE
+            # instead of blocking forever if the sink exits early.
+            source.stdout.close()
+            if source.wait():
+                print_output(source_args, source_output)
+        if source.returncode:
+            raise subprocess.CalledProcessError(source.returncode, source_args)
+
+
+def print_output(args: Sequence[str], output: IO[bytes]) -> None:
+    """Prints the output a failed command wrote to the given file."""
+    # Print the output to aid debugging (the exception message doesn't
+    # include the output).
+    output.seek(0)
+    print(
+        "Command",
+        args,
+        "printed:\n",
+        output.read().decode("utf-8", errors="replace"),
+        file=sys.stderr,
+    )
 
 
 def calculate_file_sha256(path: Path) -> str:
-    READ_SIZE = 4096
-    sha256 = hashlib.sha256()
     with open(path, "rb") as infile:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: the read loop runs in C.
+            return hashlib.file_digest(infile, "sha256").hexdigest()
+        # Older Pythons: hash in large chunks, reusing a single buffer.
+        READ_SIZE = 1 << 20
+        sha256 = hashlib.sha256()
+        buffer = bytearray(READ_SIZE)
+        view = memoryview(buffer)
         while True:
-            block = infile.read(READ_SIZE)
-            if not block:
+            size = infile.readinto(buffer)
+            if not size:
                 break
-            sha256.update(block)
+            sha256.update(view[:size])
     return sha256.hexdigest()
 
 
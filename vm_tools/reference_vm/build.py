@@ -108,7 +108,6 @@ def main():
                     f.write(fstab)
 
                 with prepare_chroot(target):
-                    shutil.copytree(DATA_PATH, target / "tmp/data")
                     shutil.copy(SETUP_SCRIPT, target / "tmp/setup.sh")
                     os.chmod(target / "tmp/setup.sh", 0o755)
                     run_in_chroot(
@@ -191,8 +190,13 @@ def setup_storage(
         text=True,
     )
 
+    # Prefer libyaml, as it's much faster than the pure Python loader.
+    if yaml.__with_libyaml__:
+        loader = yaml.CSafeLoader
+    else:
+        loader = yaml.SafeLoader
     with open(temp_dir / "disk_var.yml") as f:
-        disk_vars = yaml.load(f, Loader=yaml.SafeLoader)
+        disk_vars = yaml.load(f, Loader=loader)
     with open(temp_dir / "fstab") as f:
         fstab = f.read()
 
@@ -238,44 +242,56 @@ def mount_target(target: pathlib.Path, disk_vars: Dict[str, str]):
         subprocess.run(["umount", "-R", target], check=True)
 
 
+# (source, mountpoint relative to the chroot, fstype, options) for mounts
+# needed to run commands inside the chroot, in mount order.
+CHROOT_MOUNTS = [
+    ("/dev", "dev", "none", "bind"),
+    ("/dev/pts", "dev/pts", "none", "bind"),
+    ("sysfs", "sys", "sysfs", "defaults"),
+    ("proc", "proc", "proc", "defaults"),
+    ("tmpfs", "tmp", "tmpfs", "defaults"),
+    ("tmpfs", "run", "tmpfs", "defaults"),
+    # Expose the data files to setup.sh without copying them.
+    (str(DATA_PATH.resolve()), "tmp/data", "none", "bind,ro,X-mount.mkdir"),
+]
+
+
 @contextlib.contextmanager
 def prepare_chroot(target: pathlib.Path):
-    mounts = []
+    mounts = [target / mountpoint for _, mountpoint, _, _ in CHROOT_MOUNTS]
     try:
-        mountpoint = target / "dev"
-        subprocess.run(["mount", "--bind", "/dev", mountpoint], check=True)
-        mounts.append(mountpoint)
-
-        mountpoint = target / "dev/pts"
-        subprocess.run(["mount", "--bind", "/dev/pts", mountpoint], check=True)
-        mounts.append(mountpoint)
-
-        mountpoint = target / "sys"
-        subprocess.run(
-            ["mount", "-t", "sysfs", "sysfs", mountpoint], check=True
-        )
-        mounts.append(mountpoint)
-
-        mountpoint = target / "proc"
-        subprocess.run(["mount", "-t", "proc", "proc", mountpoint], check=True)
-        mounts.append(mountpoint)
-
-        mountpoint = target / "tmp"
-        subprocess.run(
-            ["mount", "-t", "tmpfs", "tmpfs", mountpoint], check=True
-        )
-        mounts.append(mountpoint)
-
-        mountpoint = target / "run"
-        subprocess.run(
-            ["mount", "-t", "tmpfs", "tmpfs", mountpoint], check=True
-        )
-        mounts.append(mountpoint)
+        # Set up all the mounts with a single mount(8) invocation.
+        with tempfile.NamedTemporaryFile("w", suffix=".fstab") as fstab:
+            for (source, _, fstype, options), mountpoint in zip(
+                CHROOT_MOUNTS, mounts
+            ):
+                fields = [
+                    fstab_escape(source),
+                    fstab_escape(str(mountpoint)),
+                    fstype,
+                    options,
+                    "0",
+                    "0",
+                ]
+                fstab.write(" ".join(fields) + "\n")
+            fstab.flush()
+            subprocess.run(
+                ["mount", "--all", "--fstab", fstab.name], check=True
+            )
 
         yield
     finally:
         for mountpoint in mounts[::-1]:
-            subprocess.run(["umount", mountpoint], check=True)
+            # Only some of the mounts may have succeeded.
+            if os.path.ismount(mountpoint):
+                subprocess.run(["umount", mountpoint], check=True)
+
+
+def fstab_escape(path: str) -> str:
+    """Escapes whitespace in a path for use in an fstab field."""
+    return (
+        path.replace("\\", "\\134").replace(" ", "\\040").replace("\t", "\\011")
+    )
 
 
 def run_debootstrap(